@@ -1,8 +1,15 @@
+import argparse
 import logging
+import os
+from collections import deque
+from multiprocessing import Pool
 
 # Configure logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 
+# Shards are sized by bytes so that memory per shard stays the same however large the log is
+SHARD_SIZE_BYTES = 8 * 1024 * 1024
+
 
 def parse_game_data(line):
     """
@@ -79,14 +86,192 @@ def calculate_power(cube_set):
     return cube_set['red'] * cube_set['green'] * cube_set['blue']
 
 
-def main():
+def find_shard_offsets(file_path, shard_size=SHARD_SIZE_BYTES):
+    """
+    Split a game log into newline-aligned byte ranges so each range holds only complete lines.
+
+    Args:
+    file_path (str): The path to the game log.
+    shard_size (int, optional): The approximate size of each range in bytes. Defaults to SHARD_SIZE_BYTES.
+
+    Returns:
+    list: A list of (start, end) byte offset tuples covering the whole file in order.
+    """
+    file_size = os.path.getsize(file_path)
+    boundaries = [0]
+    with open(file_path, 'rb') as file:
+        for split_point in range(shard_size, file_size, shard_size):
+            if split_point <= boundaries[-1]:
+                continue
+            # Move to the first line that starts at or after the approximate split point
+            file.seek(split_point - 1)
+            file.readline()
+            boundary = file.tell()
+            if boundaries[-1] < boundary < file_size:
+                boundaries.append(boundary)
+    boundaries.append(file_size)
+    return list(zip(boundaries[:-1], boundaries[1:]))
+
+
+def process_shard(shard):
+    """
+    Parse the games within one byte range of a game log and compute its partial results.
+
+    Args:
+    shard (tuple): A tuple of (file_path, start, end, available_cubes, include_color_maxima, include_game_lines).
+
+    Returns:
+    dict: A dictionary with the partial 'possible_id_sum' and 'total_power', plus 'color_maxima' and
+    'game_lines' when requested.
+    """
+    file_path, start, end, available_cubes, include_color_maxima, include_game_lines = shard
+    possible_id_sum = 0
+    total_power = 0
+    color_maxima = {'red': 0, 'green': 0, 'blue': 0}
+    game_lines = []
+
+    with open(file_path, 'rb') as file:
+        file.seek(start)
+        position = start
+        while position < end:
+            raw_line = file.readline()
+            if not raw_line:
+                break
+            position += len(raw_line)
+            line = raw_line.decode('utf-8')
+            if not line.strip():
+                continue
+
+            game_id, cube_counts = parse_game_data(line)
+            if is_game_possible(cube_counts, available_cubes):
+                possible_id_sum += game_id
+            min_cubes = calculate_minimum_cubes(cube_counts)
+            game_power = calculate_power(min_cubes)
+            total_power += game_power
+            if include_color_maxima:
+                for color in min_cubes:
+                    color_maxima[color] = max(color_maxima.get(color, 0), min_cubes[color])
+            if include_game_lines:
+                game_lines.append(f"Game {game_id}: Minimum cubes {min_cubes}, Power {game_power}")
+
+    partial = {'possible_id_sum': possible_id_sum, 'total_power': total_power}
+    if include_color_maxima:
+        partial['color_maxima'] = color_maxima
+    if include_game_lines:
+        partial['game_lines'] = game_lines
+    return partial
+
+
+def reduce_partial_results(partials):
+    """
+    Combine the partial results of several shards into final totals.
+
+    Args:
+    partials (iterable): Partial result dictionaries as returned by process_shard.
+
+    Returns:
+    dict: A dictionary with the combined 'possible_id_sum' and 'total_power', plus 'color_maxima' when the
+    partials carry them. Per-game output lines are not kept.
+    """
+    totals = {'possible_id_sum': 0, 'total_power': 0}
+    for partial in partials:
+        totals['possible_id_sum'] += partial['possible_id_sum']
+        totals['total_power'] += partial['total_power']
+        if 'color_maxima' in partial:
+            color_maxima = totals.setdefault('color_maxima', {'red': 0, 'green': 0, 'blue': 0})
+            for color, count in partial['color_maxima'].items():
+                color_maxima[color] = max(color_maxima.get(color, 0), count)
+    return totals
+
+
+def iter_shard_results(file_path, available_cubes, workers=None, shard_size=SHARD_SIZE_BYTES,
+                       include_color_maxima=False, include_game_lines=False):
+    """
+    Process a game log in newline-aligned shards across worker processes, yielding each shard's partial
+    results in file order. At most two shards per worker are in flight at once, so the parent never holds
+    more than a fixed number of finished shards however large the log is.
+
+    Args:
+    file_path (str): The path to the game log.
+    available_cubes (dict): A dictionary with the available cube counts for each color.
+    workers (int, optional): The number of worker processes. Defaults to the number of CPUs. A value of 1
+    processes the shards in the current process.
+    shard_size (int, optional): The approximate size of each shard in bytes. Defaults to SHARD_SIZE_BYTES.
+    include_color_maxima (bool, optional): Whether to compute the per-color maxima. Defaults to False.
+    include_game_lines (bool, optional): Whether to keep the per-game output lines. Defaults to False.
+
+    Yields:
+    dict: The partial results of each shard, in the order the shards appear in the file.
+
+    Raises:
+    ValueError: If workers is less than 1.
+    """
+    if workers is None:
+        workers = os.cpu_count() or 1
+    elif workers < 1:
+        raise ValueError(f"The number of workers must be at least 1, got {workers}.")
+    shards = [
+        (file_path, start, end, available_cubes, include_color_maxima, include_game_lines)
+        for start, end in find_shard_offsets(file_path, shard_size)
+    ]
+
+    if workers == 1 or len(shards) <= 1:
+        for shard in shards:
+            yield process_shard(shard)
+        return
+
+    remaining = iter(shards)
+    with Pool(min(workers, len(shards))) as pool:
+        pending = deque()
+        for shard in remaining:
+            pending.append(pool.apply_async(process_shard, (shard,)))
+            if len(pending) >= workers * 2:
+                break
+
+        while pending:
+            partial = pending.popleft().get()
+            next_shard = next(remaining, None)
+            if next_shard is not None:
+                pending.append(pool.apply_async(process_shard, (next_shard,)))
+            yield partial
+
+
+def process_game_log_sharded(file_path, available_cubes, workers=None, shard_size=SHARD_SIZE_BYTES,
+                             include_color_maxima=False):
+    """
+    Compute the possible-ID sum and total power of a game log using sharded worker processes.
+
+    Args:
+    file_path (str): The path to the game log.
+    available_cubes (dict): A dictionary with the available cube counts for each color.
+    workers (int, optional): The number of worker processes. Defaults to the number of CPUs.
+    shard_size (int, optional): The approximate size of each shard in bytes. Defaults to SHARD_SIZE_BYTES.
+    include_color_maxima (bool, optional): Whether to compute the per-color maxima. Defaults to False.
+
+    Returns:
+    dict: A dictionary with the final 'possible_id_sum' and 'total_power', plus 'color_maxima' when requested.
+    """
+    return reduce_partial_results(
+        iter_shard_results(file_path, available_cubes, workers, shard_size, include_color_maxima)
+    )
+
+
+def main(file_path='data/day2_data.txt', workers=None):
     """
     Main function to execute the puzzle solution. It reads game data, determines possible games and their
     minimum cube requirements, and calculates the total power.
+
+    Args:
+    file_path (str, optional): The path to the game log. Defaults to 'data/day2_data.txt'.
+    workers (int, optional): When given, the log is processed in shards across this many worker processes
+    instead of in a single pass. Defaults to None.
     """
+    if workers is not None:
+        main_sharded(file_path, workers)
+        return
 
     # Read data from data file
-    with open('data/day2_data.txt', 'r') as file:
+    with open(file_path, 'r') as file:
         lines = file.readlines()
 
     # Part 1 Solution
@@ -112,5 +297,56 @@ def main():
     print(f"The sum of the power of the minimum sets is: {total_power}")
 
 
+def main_sharded(file_path, workers):
+    """
+    Execute the puzzle solution by processing the game log in shards across worker processes. The per-game
+    output lines are printed in file order as each shard completes.
+
+    Args:
+    file_path (str): The path to the game log.
+    workers (int): The number of worker processes.
+    """
+    available_cubes = {'red': 12, 'green': 13, 'blue': 14}
+
+    def print_game_lines(partials):
+        for partial in partials:
+            for game_line in partial.pop('game_lines'):
+                print(game_line)
+            yield partial
+
+    totals = reduce_partial_results(print_game_lines(
+        iter_shard_results(file_path, available_cubes, workers, include_game_lines=True)
+    ))
+    print(f"The sum of the IDs of the possible games is: {totals['possible_id_sum']}")
+    print(f"The sum of the power of the minimum sets is: {totals['total_power']}")
+
+
+def positive_int(value):
+    """
+    Parse a command line value as an integer of at least 1.
+
+    Args:
+    value (str): The command line value.
+
+    Returns:
+    int: The parsed integer.
+
+    Raises:
+    argparse.ArgumentTypeError: If the value is not an integer of at least 1.
+    """
+    try:
+        number = int(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid int value: '{value}'") from None
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"must be at least 1, got {number}")
+    return number
+
+
 if __name__ == "__main__":
-    main()
+    parser = argparse.ArgumentParser(description='Solve Advent of Code 2023 day 2.')
+    parser.add_argument('file_path', nargs='?', default='data/day2_data.txt', help='path to the game log')
+    parser.add_argument('--workers', type=positive_int,
+                        help='process the log in shards across this many worker processes')
+    args = parser.parse_args()
+    main(args.file_path, args.workers)
@@ -0,0 +1,422 @@
+"""
+parity.py
+
+Description:
+This script checks that every backend for the Advent of Code 2023 solutions gives the same answers as the
+reference functions and that no backend quietly gets slower. Each day registers its backends in BACKENDS; every
+backend takes the path to a puzzle input and returns the answers for both parts. The script runs all backends
+on the inputs in data/ and on seeded synthetic inputs and compares their answers with the reference backend.
+It then times every backend on a large synthetic input, so that per-line work dominates over fixed costs such as
+starting worker processes, and compares each time with the backend's earlier time on the same kind of host. The
+baseline is stored per CPU count and worker count, and the gate fails when a backend is slower than its baseline
+by more than the allowed tolerance. Backends without a baseline for the current host are skipped unless
+--require-baseline is given.
+
+License:
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+   http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+import argparse
+import functools
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+
+from day_1 import find_first_last_number
+from day_2 import SHARD_SIZE_BYTES, calculate_minimum_cubes, calculate_power, is_game_possible, parse_game_data, \
+    process_game_log_sharded
+from day_3 import calculate_gear_ratios, sum_part_numbers
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data')
+BASELINE_PATH = os.path.join(DATA_DIR, 'performance_baseline.json')
+DATA_FILES = {
+    'day_1': os.path.join(DATA_DIR, 'day1_data.txt'),
+    'day_2': os.path.join(DATA_DIR, 'day2_data.txt'),
+    'day_3': os.path.join(DATA_DIR, 'day3_data.txt'),
+}
+AVAILABLE_CUBES = {'red': 12, 'green': 13, 'blue': 14}
+DEFAULT_TOLERANCE = 0.5
+REFERENCE_BACKEND = 'reference'
+WORKERS_ENV_VAR = 'AOC_WORKERS'
+# Small enough that every parity input is split into several shards across several worker processes
+PARITY_SHARD_SIZE = 4096
+PARITY_WORKERS = 2
+
+
+def configured_workers():
+    """Gets the number of worker processes for multiprocess backends.
+
+    Returns:
+        int: The value of the AOC_WORKERS environment variable, or the number of CPUs when it is not set.
+    """
+    return int(os.environ.get(WORKERS_ENV_VAR) or os.cpu_count() or 1)
+
+
+def host_key(workers):
+    """Builds the key under which a host's timing baseline is stored.
+
+    Args:
+        workers (int): The number of worker processes used by multiprocess backends.
+
+    Returns:
+        str: A key made of the CPU count and the worker count.
+    """
+    return f"cpus-{os.cpu_count()}-workers-{workers}"
+
+
+def day1_reference(file_path):
+    """Solves day 1 with find_first_last_number, skipping lines without a number as day_1.main does.
+
+    Args:
+        file_path (str): The path to the puzzle input.
+
+    Returns:
+        tuple: The calibration total.
+    """
+    total = 0
+    with open(file_path, 'r') as file:
+        for line in file:
+            try:
+                total += find_first_last_number(line.strip())
+            except ValueError:
+                continue
+    return (total,)
+
+
+def day2_reference(file_path):
+    """Solves day 2 with parse_game_data, is_game_possible and calculate_power.
+
+    Args:
+        file_path (str): The path to the puzzle input.
+
+    Returns:
+        tuple: The sum of the possible game IDs and the sum of the powers of the minimum sets.
+    """
+    possible_id_sum = 0
+    total_power = 0
+    with open(file_path, 'r') as file:
+        for line in file:
+            if not line.strip():
+                continue
+            game_id, cube_counts = parse_game_data(line)
+            if is_game_possible(cube_counts, AVAILABLE_CUBES):
+                possible_id_sum += game_id
+            total_power += calculate_power(calculate_minimum_cubes(cube_counts))
+    return possible_id_sum, total_power
+
+
+def day2_sharded(file_path, workers=None, shard_size=SHARD_SIZE_BYTES):
+    """Solves day 2 with the sharded multiprocess backend.
+
+    Args:
+        file_path (str): The path to the puzzle input.
+        workers (int, optional): The number of worker processes. Defaults to configured_workers().
+        shard_size (int, optional): The approximate size of each shard in bytes. Defaults to SHARD_SIZE_BYTES.
+
+    Returns:
+        tuple: The sum of the possible game IDs and the sum of the powers of the minimum sets.
+    """
+    totals = process_game_log_sharded(file_path, AVAILABLE_CUBES, workers=workers or configured_workers(),
+                                      shard_size=shard_size)
+    return totals['possible_id_sum'], totals['total_power']
+
+
+def day3_reference(file_path):
+    """Solves day 3 with sum_part_numbers and calculate_gear_ratios.
+
+    Args:
+        file_path (str): The path to the puzzle input.
+
+    Returns:
+        tuple: The sum of the part numbers and the sum of the gear ratios.
+    """
+    with open(file_path, 'r') as file:
+        schematic = [line.strip() for line in file if line.strip()]
+    return sum_part_numbers(schematic), calculate_gear_ratios(schematic)
+
+
+# Every day maps backend names to callables; the 'reference' backend defines the expected answers
+BACKENDS = {
+    'day_1': {REFERENCE_BACKEND: day1_reference},
+    'day_2': {REFERENCE_BACKEND: day2_reference, 'sharded': day2_sharded},
+    'day_3': {REFERENCE_BACKEND: day3_reference},
+}
+# Extra configurations that are only checked for parity, such as ones that force small inputs through the
+# multiprocess path; they are not timed
+PARITY_BACKENDS = {
+    'day_2': {
+        'sharded_small_shards': functools.partial(day2_sharded, workers=PARITY_WORKERS, shard_size=PARITY_SHARD_SIZE),
+    },
+}
+
+
+def generate_day1_lines(rng, count):
+    """Generates random calibration lines mixing letters, digits and spelled-out numbers.
+
+    Args:
+        rng (random.Random): The seeded random number generator.
+        count (int): The number of lines to generate.
+
+    Returns:
+        list: The generated lines, each containing at least one number.
+    """
+    words = ['one', 'two', 'three', 'four', 'five', 'six', 'seven', 'eight', 'nine']
+    lines = []
+    for _ in range(count):
+        tokens = []
+        for _ in range(rng.randint(1, 8)):
+            choice = rng.random()
+            if choice < 0.3:
+                tokens.append(str(rng.randint(1, 9)))
+            elif choice < 0.6:
+                tokens.append(rng.choice(words))
+            else:
+                tokens.append(''.join(rng.choice('abcdefghijklmnopqrstuvwxyz') for _ in range(rng.randint(1, 5))))
+        tokens.insert(rng.randint(0, len(tokens)), str(rng.randint(1, 9)))
+        lines.append(''.join(tokens))
+    return lines
+
+
+def generate_day2_lines(rng, count):
+    """Generates random game records in the day 2 format.
+
+    Args:
+        rng (random.Random): The seeded random number generator.
+        count (int): The number of games to generate.
+
+    Returns:
+        list: The generated game lines.
+    """
+    lines = []
+    for game_id in range(1, count + 1):
+        subsets = []
+        for _ in range(rng.randint(1, 6)):
+            colors = rng.sample(['red', 'green', 'blue'], rng.randint(1, 3))
+            subsets.append(', '.join(f"{rng.randint(1, 20)} {color}" for color in colors))
+        lines.append(f"Game {game_id}: {'; '.join(subsets)}")
+    return lines
+
+
+def generate_day3_lines(rng, count):
+    """Generates a random square engine schematic in the day 3 format.
+
+    Args:
+        rng (random.Random): The seeded random number generator.
+        count (int): The width and height of the schematic.
+
+    Returns:
+        list: The generated schematic rows.
+    """
+    rows = []
+    for _ in range(count):
+        row = ''
+        while len(row) < count:
+            choice = rng.random()
+            if choice < 0.2:
+                row += str(rng.randint(1, 999))
+            elif choice < 0.3:
+                row += rng.choice('*#+$/@=%&-')
+            else:
+                row += '.'
+        rows.append(row[:count])
+    return rows
+
+
+GENERATORS = {
+    'day_1': generate_day1_lines,
+    'day_2': generate_day2_lines,
+    'day_3': generate_day3_lines,
+}
+SYNTHETIC_SIZES = {'day_1': 2000, 'day_2': 2000, 'day_3': 60}
+# Large enough that parsing dominates; the day 2 input spans several shards of the sharded backend
+TIMING_SIZES = {'day_1': 50000, 'day_2': 300000, 'day_3': 400}
+TIMING_SEED = 2023
+
+
+def write_synthetic_input(day, seed, directory, size=None):
+    """Writes a seeded synthetic puzzle input for a day.
+
+    Args:
+        day (str): The day to generate an input for, such as 'day_2'.
+        seed (int): The seed for the random number generator.
+        directory (str): The directory to write the input to.
+        size (int, optional): The size of the input. Defaults to SYNTHETIC_SIZES for the day.
+
+    Returns:
+        str: The path to the written input.
+    """
+    rng = random.Random(seed)
+    lines = GENERATORS[day](rng, size or SYNTHETIC_SIZES[day])
+    file_path = os.path.join(directory, f"{day}_synthetic_{seed}.txt")
+    with open(file_path, 'w') as file:
+        file.write('\n'.join(lines) + '\n')
+    return file_path
+
+
+def check_parity(day, file_path):
+    """Runs every backend of a day, including its parity-only configurations, on an input and compares the
+    answers with the reference backend.
+
+    Args:
+        day (str): The day to check, such as 'day_2'.
+        file_path (str): The path to the puzzle input.
+
+    Returns:
+        list: A message for every backend whose answers differ from the reference. Empty when all agree.
+    """
+    backends = dict(BACKENDS[day], **PARITY_BACKENDS.get(day, {}))
+    expected = backends[REFERENCE_BACKEND](file_path)
+    mismatches = []
+    for name, backend in backends.items():
+        if name == REFERENCE_BACKEND:
+            continue
+        result = backend(file_path)
+        if result != expected:
+            mismatches.append(f"{day}/{name} on {file_path}: got {result}, expected {expected}")
+    return mismatches
+
+
+def time_backends(day, file_path, repeats=3):
+    """Times every backend of a day and checks that each one still matches the reference on the timed input.
+
+    Args:
+        day (str): The day to time, such as 'day_2'.
+        file_path (str): The path to the puzzle input.
+        repeats (int, optional): The number of runs per backend; the fastest run is kept. Defaults to 3.
+
+    Returns:
+        tuple: The fastest time in seconds of each backend, and a message for every backend whose answers
+        differ from the reference.
+    """
+    timings = {}
+    results = {}
+    for name, backend in BACKENDS[day].items():
+        best = float('inf')
+        for _ in range(repeats):
+            start = time.perf_counter()
+            results[name] = backend(file_path)
+            best = min(best, time.perf_counter() - start)
+        timings[name] = best
+
+    expected = results[REFERENCE_BACKEND]
+    mismatches = [
+        f"{day}/{name} on {file_path}: got {result}, expected {expected}"
+        for name, result in results.items()
+        if result != expected
+    ]
+    return timings, mismatches
+
+
+def check_regressions(timings, baseline, tolerance=DEFAULT_TOLERANCE):
+    """Compares backend timings with the stored baseline of the same host.
+
+    Args:
+        timings (dict): The measured times in seconds keyed by day and then backend name.
+        baseline (dict): The baseline times of this host in the same layout.
+        tolerance (float, optional): The allowed relative slowdown, e.g. 0.5 for 50%. Defaults to DEFAULT_TOLERANCE.
+
+    Returns:
+        tuple: A message for every backend slower than its baseline by more than the tolerance, and a message
+        for every backend that has no baseline and so could not be checked.
+    """
+    regressions = []
+    missing = []
+    for day, day_timings in timings.items():
+        for name, elapsed in day_timings.items():
+            expected = baseline.get(day, {}).get(name)
+            if expected is None:
+                missing.append(f"{day}/{name}: no baseline for this host, run with --update-baseline")
+            elif elapsed > expected * (1 + tolerance):
+                regressions.append(f"{day}/{name}: {elapsed:.3f}s, baseline {expected:.3f}s")
+    return regressions, missing
+
+
+def load_baseline(baseline_path=BASELINE_PATH):
+    """Loads the stored timing baseline.
+
+    Args:
+        baseline_path (str, optional): The path to the baseline file. Defaults to BASELINE_PATH.
+
+    Returns:
+        dict: The baselines keyed by host_key, or an empty dictionary if no baseline has been stored.
+    """
+    try:
+        with open(baseline_path, 'r') as file:
+            return json.load(file)
+    except FileNotFoundError:
+        return {}
+
+
+def main(argv=None):
+    """Main function to run the parity checks and the performance regression gate.
+
+    Args:
+        argv (list, optional): The command line arguments. Defaults to sys.argv[1:].
+
+    Returns:
+        int: 0 when every backend matches the reference and none has regressed, 1 otherwise. Backends without
+        a baseline for this host are reported as skipped and only fail the run with --require-baseline.
+    """
+    parser = argparse.ArgumentParser(description='Check backend parity and timing regressions.')
+    parser.add_argument('--seeds', type=int, default=3, help='number of seeded synthetic inputs per day')
+    parser.add_argument('--tolerance', type=float, default=DEFAULT_TOLERANCE, help='allowed relative slowdown')
+    parser.add_argument('--update-baseline', action='store_true', help='store the measured times as the baseline')
+    parser.add_argument('--require-baseline', action='store_true', help='fail when a backend has no baseline')
+    args = parser.parse_args(argv)
+
+    workers = configured_workers()
+    key = host_key(workers)
+    failures = []
+    timings = {}
+    with tempfile.TemporaryDirectory() as directory:
+        for day in BACKENDS:
+            inputs = [DATA_FILES[day]] + [write_synthetic_input(day, seed, directory) for seed in range(args.seeds)]
+            for file_path in inputs:
+                failures.extend(check_parity(day, file_path))
+            timing_input = write_synthetic_input(day, TIMING_SEED, directory, TIMING_SIZES[day])
+            timings[day], mismatches = time_backends(day, timing_input)
+            failures.extend(mismatches)
+
+    print(f"Host {key}")
+    for day, day_timings in timings.items():
+        for name, elapsed in day_timings.items():
+            print(f"{day}/{name}: {elapsed:.3f}s")
+
+    baselines = load_baseline()
+    if args.update_baseline and failures:
+        print("Baseline not updated because some backends do not match the reference")
+    elif args.update_baseline:
+        baselines[key] = {'cpus': os.cpu_count(), 'workers': workers, 'timings': timings}
+        with open(BASELINE_PATH, 'w') as file:
+            json.dump(baselines, file, indent=4, sort_keys=True)
+            file.write('\n')
+        print(f"Baseline for {key} written to {BASELINE_PATH}")
+    else:
+        baseline = baselines.get(key, {}).get('timings', {})
+        regressions, missing = check_regressions(timings, baseline, args.tolerance)
+        failures.extend(regressions)
+        if args.require_baseline:
+            failures.extend(missing)
+        else:
+            for message in missing:
+                print(f"SKIP {message}")
+
+    for failure in failures:
+        print(f"FAIL {failure}")
+    return 1 if failures else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
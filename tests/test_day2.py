@@ -1,5 +1,8 @@
+import argparse
+
 import pytest
-from day_2 import calculate_minimum_cubes, calculate_power, parse_game_data, is_game_possible
+from day_2 import calculate_minimum_cubes, calculate_power, parse_game_data, is_game_possible, \
+    find_shard_offsets, iter_shard_results, process_game_log_sharded, positive_int
 
 
 def test_parse_game_data():
@@ -52,3 +55,76 @@ def test_calculate_power():
     cube_set = {'red': 2, 'green': 3, 'blue': 4}
     expected_power = 2 * 3 * 4
     assert calculate_power(cube_set) == expected_power
+
+
+GAME_LOG = (
+    "Game 1: 3 blue, 4 red; 1 red, 2 green, 6 blue; 2 green\n"
+    "Game 2: 1 blue, 2 green; 3 green, 4 blue, 1 red; 1 green, 1 blue\n"
+    "Game 3: 8 green, 6 blue, 20 red; 5 blue, 4 red, 13 green; 5 green, 1 red\n"
+    "Game 4: 1 green, 3 red, 6 blue; 3 green, 6 red; 3 green, 15 blue, 14 red\n"
+    "Game 5: 6 red, 1 blue, 3 green; 2 blue, 1 red, 2 green\n"
+)
+
+
+def test_find_shard_offsets(tmp_path):
+    log_file = tmp_path / "games.txt"
+    log_file.write_text(GAME_LOG)
+    data = log_file.read_bytes()
+
+    offsets = find_shard_offsets(str(log_file), 100)
+    assert len(offsets) == 3
+    # Shards cover the whole file in order and each one starts at the beginning of a line
+    assert offsets[0][0] == 0
+    assert offsets[-1][1] == len(data)
+    for (_, end), (start, _) in zip(offsets, offsets[1:]):
+        assert end == start
+        assert data[start - 1:start] == b"\n"
+
+    # Shards smaller than a line still yield whole lines only
+    assert len(find_shard_offsets(str(log_file), 1)) == 5
+
+    # A shard larger than the file covers it in one range
+    assert find_shard_offsets(str(log_file), 10 ** 6) == [(0, len(data))]
+
+
+@pytest.mark.parametrize("workers,shard_size", [(1, 10 ** 6), (1, 64), (2, 100), (2, 1)])
+def test_process_game_log_sharded(tmp_path, workers, shard_size):
+    log_file = tmp_path / "games.txt"
+    log_file.write_text(GAME_LOG)
+    available_cubes = {'red': 12, 'green': 13, 'blue': 14}
+
+    totals = process_game_log_sharded(str(log_file), available_cubes, workers, shard_size,
+                                      include_color_maxima=True)
+    assert totals['possible_id_sum'] == 8  # Example given in the problem
+    assert totals['total_power'] == 2286
+    assert totals['color_maxima'] == {'red': 20, 'green': 13, 'blue': 15}
+
+
+def test_iter_shard_results_keeps_game_order(tmp_path):
+    log_file = tmp_path / "games.txt"
+    log_file.write_text(GAME_LOG)
+    available_cubes = {'red': 12, 'green': 13, 'blue': 14}
+
+    game_lines = [
+        game_line
+        for partial in iter_shard_results(str(log_file), available_cubes, 2, 1, include_game_lines=True)
+        for game_line in partial['game_lines']
+    ]
+    assert [line.split(':')[0] for line in game_lines] == [f"Game {i}" for i in range(1, 6)]
+    assert game_lines[0] == "Game 1: Minimum cubes {'red': 4, 'green': 2, 'blue': 6}, Power 48"
+
+
+@pytest.mark.parametrize("workers", [0, -1])
+def test_iter_shard_results_rejects_invalid_workers(tmp_path, workers):
+    log_file = tmp_path / "games.txt"
+    log_file.write_text(GAME_LOG)
+
+    with pytest.raises(ValueError):
+        list(iter_shard_results(str(log_file), {'red': 12, 'green': 13, 'blue': 14}, workers))
+
+
+def test_positive_int():
+    assert positive_int("4") == 4
+    for value in ["0", "-2", "two"]:
+        with pytest.raises(argparse.ArgumentTypeError):
+            positive_int(value)
@@ -0,0 +1,69 @@
+import pytest
+from day_2 import find_shard_offsets
+from parity import BACKENDS, DATA_FILES, PARITY_SHARD_SIZE, check_parity, check_regressions, configured_workers, \
+    host_key, time_backends, write_synthetic_input
+
+
+@pytest.mark.parametrize("day", sorted(BACKENDS))
+def test_backends_match_reference_on_data(day):
+    assert check_parity(day, DATA_FILES[day]) == []
+
+
+@pytest.mark.parametrize("day", sorted(BACKENDS))
+@pytest.mark.parametrize("seed", [0, 1, 2])
+def test_backends_match_reference_on_synthetic_input(tmp_path, day, seed):
+    file_path = write_synthetic_input(day, seed, str(tmp_path), size=200 if day != 'day_3' else 30)
+    assert check_parity(day, file_path) == []
+
+
+@pytest.mark.parametrize("size", [100, 200, 2000])
+def test_parity_inputs_span_several_shards(tmp_path, size):
+    # The sharded parity check only covers the multiprocess path if its inputs split into several shards
+    file_path = write_synthetic_input('day_2', 0, str(tmp_path), size=size)
+    assert len(find_shard_offsets(file_path, PARITY_SHARD_SIZE)) > 1
+    assert len(find_shard_offsets(DATA_FILES['day_2'], PARITY_SHARD_SIZE)) > 1
+
+
+def test_time_backends_checks_results(tmp_path):
+    file_path = write_synthetic_input('day_2', 0, str(tmp_path), size=200)
+    timings, mismatches = time_backends('day_2', file_path, repeats=1)
+    assert set(timings) == set(BACKENDS['day_2'])
+    assert mismatches == []
+
+
+def test_synthetic_input_is_seeded(tmp_path):
+    (tmp_path / "first").mkdir()
+    (tmp_path / "second").mkdir()
+    first = write_synthetic_input('day_2', 7, str(tmp_path / "first"), size=50)
+    second = write_synthetic_input('day_2', 7, str(tmp_path / "second"), size=50)
+    with open(first) as first_file, open(second) as second_file:
+        assert first_file.read() == second_file.read()
+
+
+def test_check_regressions():
+    baseline = {'day_2': {'reference': 2.0, 'sharded': 1.0}}
+
+    # Within the tolerance
+    assert check_regressions({'day_2': {'reference': 2.5, 'sharded': 1.4}}, baseline, tolerance=0.5) == ([], [])
+
+    # Past the tolerance
+    regressions, missing = check_regressions({'day_2': {'sharded': 1.6}}, baseline, tolerance=0.5)
+    assert len(regressions) == 1
+    assert regressions[0].startswith('day_2/sharded')
+    assert missing == []
+
+    # Backends without a baseline are reported separately
+    regressions, missing = check_regressions({'day_1': {'fast': 10.0}}, baseline)
+    assert regressions == []
+    assert len(missing) == 1
+    assert missing[0].startswith('day_1/fast: no baseline')
+
+
+def test_configured_workers(monkeypatch):
+    monkeypatch.setenv('AOC_WORKERS', '3')
+    assert configured_workers() == 3
+    assert host_key(3).endswith('-workers-3')
+
+    monkeypatch.delenv('AOC_WORKERS')
+    assert configured_workers() >= 1
+